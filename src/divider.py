@@ -1,26 +1,118 @@
 from assassyn.frontend import *
 from .debug_utils import debug_log
+from .divider_magic import constant_divisor_magic
+
+
+def _msb(x):
+    # Sign / borrow bit of a value as a 1-bit slice
+    msb = x.dtype.bits - 1
+    return x[msb:msb]
+
+
+def _negate_if(x, neg):
+    # Branchless conditional two's complement: (x ^ mask) + neg, with mask = neg replicated.
+    # One XOR row and an incrementer instead of a negation plus a full-width mux.
+    width = x.dtype.bits
+    mask = neg.select(Bits(width)((1 << width) - 1), Bits(width)(0))
+    carry_in = concat(Bits(width - 1)(0), neg)
+    return ((x ^ mask).bitcast(UInt(width)) + carry_in.bitcast(UInt(width))).bitcast(Bits(width))
+
+
+def _count_leading_zeros(x):
+    """
+    Log-depth leading-zero count of a power-of-two-wide value.
+    Returns (all_zero, count): count is log2(width) bits and only meaningful
+    when all_zero is 0.
+    """
+    width = x.dtype.bits
+    hi = x[width // 2:width - 1]
+    lo = x[0:width // 2 - 1]
+    if width == 2:
+        return (~hi & ~lo), ~hi
+    hi_zero, hi_count = _count_leading_zeros(hi)
+    lo_zero, lo_count = _count_leading_zeros(lo)
+    # Leading one in the upper half: its count; otherwise half the width plus the lower count
+    return (hi_zero & lo_zero), concat(hi_zero, hi_zero.select(lo_count, hi_count))
+
+
+def _compress_3_2(a, b, c):
+    # Width-generic 3:2 compressor (as multiplier.full_adder_64bit): a + b + c == sum + carry
+    width = a.dtype.bits
+    carry = (a & b) | (b & c) | (a & c)
+    return a ^ b ^ c, concat(carry[0:width - 2], Bits(1)(0))
+
+
+def _mul_by_constant(x, c, width):
+    # x * c truncated to width bits, for a constant c known at elaboration time:
+    # one shifted copy of x per set bit of c (the shifts are wiring), reduced
+    # Wallace-style with 3:2 compressors to two rows and summed by a single adder,
+    # so the depth grows with log(popcount(c)) instead of one adder per set bit
+    x_ext = x if x.dtype.bits == width else concat(Bits(width - x.dtype.bits)(0), x)
+    rows = [x_ext if i == 0 else concat(x_ext[0:width - 1 - i], Bits(i)(0))
+            for i in range(width) if (c >> i) & 1]
+    while len(rows) > 2:
+        level = []
+        for i in range(0, len(rows) - 2, 3):
+            level.extend(_compress_3_2(rows[i], rows[i + 1], rows[i + 2]))
+        rows = level + rows[len(rows) - len(rows) % 3:]
+    if len(rows) == 1:
+        return rows[0]
+    return (rows[0].bitcast(UInt(width)) + rows[1].bitcast(UInt(width))).bitcast(Bits(width))
 
 
 class Radix16Divider:
     """
-    The divider is a multi-cycle functional unit that takes ~10 cycles:
-    - 1 cycle: Preprocessing
-    - 8 cycles: Iterative calculation (4 bits per cycle with QDS)
-    - 1 cycle: Post-processing
+    The divider is a multi-cycle functional unit that takes 1 to 9 cycles, counted
+    as tick() calls up to and including the one that writes the result (the
+    cycles reported by divider_model.divide()):
+    - 1 cycle: Preprocessing (done in IDLE, together with special-case detection)
+      Trivial cases (divisor 0, |divisor| a power of two, |dividend| < |divisor|)
+      return here.
+    - 1 to 8 cycles: Iterative calculation (4 bits per cycle with QDS), with the
+      post-processing (sign correction) chained onto the last iteration. Leading
+      quotient digits known to be 0 are skipped, and the loop ends early once
+      nothing is left to divide.
+
+    With signed=False the unit only implements DIVU/REMU: the absolute-value
+    conversion and the sign corrections are not elaborated at all.
+
+    unroll_factor (1, 2, 4 or 8) chains that many radix-16 steps combinationally
+    in each DIV_WORKING cycle, so the loop runs 8 / unroll_factor times. 8 gives a
+    single-cycle iteration phase at the cost of a very deep combinational path.
+
+    radix=2 swaps the QDS for a single trial subtraction per step (1 quotient bit,
+    32 steps, no stored divisor multiples): much less logic per cycle and a shorter
+    critical path, for when area or fmax matter more than latency. unroll_factor
+    then chains 1 to 32 of those steps per cycle.
     """
 
-    def __init__(self):
+    def __init__(self, signed=True, unroll_factor=1, radix=16):
+        assert radix in (2, 16), "radix must be 2 or 16"
+        self.step_bits = 4 if radix == 16 else 1  # quotient bits per step
+        steps = 32 // self.step_bits
+        assert unroll_factor & (unroll_factor - 1) == 0 and 0 < unroll_factor <= steps, \
+            f"unroll_factor must divide the {steps} radix-{radix} steps"
+        self.signed = signed
+        self.radix = radix
+        self.unroll_factor = unroll_factor
+        self.iterations = steps // unroll_factor
+        self.unroll_log2 = unroll_factor.bit_length() - 1
+
         # Control and status registers
         self.busy = RegArray(Bits(1), 1, initializer=[0])
         self.valid_in = RegArray(Bits(1), 1, initializer=[0])
 
-        # Input operands (captured when valid)
-        self.dividend_in = RegArray(Bits(32), 1, initializer=[0])
-        self.divisor_in = RegArray(Bits(32), 1, initializer=[0])
-        self.is_signed = RegArray(Bits(1), 1, initializer=[0])
-        self.is_rem = RegArray(Bits(1), 1, initializer=[0])  # 1=remainder, 0=quotient
-        self.rd_in = RegArray(Bits(5), 1, initializer=[0])  # Destination register
+        # Input operands (captured when valid), packed into one register since they are
+        # only ever written together by start_divide. start_divide already converts the
+        # operands to magnitudes, so IDLE does not spend two negations before its checks:
+        # signed:   {rd_in[103:99], is_rem[98], divisor_neg[97], dividend_neg[96],
+        #            dividend_in[95:64], divisor_abs[63:32], dividend_abs[31:0]}
+        # unsigned: {rd_in[69:65], is_rem[64], divisor_in[63:32], dividend_in[31:0]}
+        # is_rem: 1=remainder, 0=quotient; rd_in: destination register
+        # The register holds until the next start_divide, which only comes once the divider
+        # is no longer busy, so the control bits and sign flags are read from it directly
+        # in the last iteration instead of being copied into separate latches.
+        self.request = RegArray(Bits(104 if signed else 70), 1, initializer=[0])
 
         # Output results
         self.result = RegArray(Bits(32), 1, initializer=[0])
@@ -29,132 +121,138 @@ class Radix16Divider:
         self.rd_out = RegArray(Bits(5), 1, initializer=[0])  # Output destination register
 
         # State machine registers
-        self.state = RegArray(Bits(3), 1, initializer=[0])  # FSM state
-        self.div_cnt = RegArray(Bits(5), 1, initializer=[0])  # Iteration counter (counts down)
-
-        # Internal working registers
-        self.dividend_r = RegArray(Bits(32), 1, initializer=[0])  # Unsigned dividend
-        self.divisor_r = RegArray(Bits(32), 1, initializer=[0])  # Unsigned divisor
-
-        # Radix-16 specific registers
-        self.quotient = RegArray(Bits(32), 1, initializer=[0])  # Quotient accumulator
-        self.remainder = RegArray(Bits(36), 1,
-                                  initializer=[0])  # Partial remainder (36 bits for 4-bit shift + 15*d overflow)
-
-        # QDS-optimized divisor multiples - only need d, 2d, 4d, 8d for binary search
-        # These are stored as normalized (shifted) values for efficient QDS lookup
-        self.d1 = RegArray(Bits(36), 1, initializer=[0])  # 1*d (normalized)
-        self.d2 = RegArray(Bits(36), 1, initializer=[0])  # 2*d (normalized)
-        self.d3 = RegArray(Bits(36), 1, initializer=[0])  # 3*d (for QDS refinement)
-        self.d4 = RegArray(Bits(36), 1, initializer=[0])  # 4*d (normalized)
-        self.d5 = RegArray(Bits(36), 1, initializer=[0])  # 5*d (for QDS refinement)
-        self.d6 = RegArray(Bits(36), 1, initializer=[0])  # 6*d (for QDS refinement)
-        self.d7 = RegArray(Bits(36), 1, initializer=[0])  # 7*d (for QDS refinement)
-        self.d8 = RegArray(Bits(36), 1, initializer=[0])  # 8*d (normalized)
-        self.d9 = RegArray(Bits(36), 1, initializer=[0])  # 9*d (for QDS level 4)
-        self.d10 = RegArray(Bits(36), 1, initializer=[0])  # 10*d (for QDS level 3)
-        self.d11 = RegArray(Bits(36), 1, initializer=[0])  # 11*d (for QDS level 4)
-        self.d12 = RegArray(Bits(36), 1, initializer=[0])  # 12*d (for QDS level 2)
-        self.d13 = RegArray(Bits(36), 1, initializer=[0])  # 13*d (for QDS level 4)
-        self.d14 = RegArray(Bits(36), 1, initializer=[0])  # 14*d (for QDS level 3)
-        self.d15 = RegArray(Bits(36), 1, initializer=[0])  # 15*d (for QDS level 4)
-
-        # Sign tracking for final correction
-        self.div_sign = RegArray(Bits(2), 1, initializer=[0])  # Sign bits {dividend[31], divisor[31]}
-        self.sign_r = RegArray(Bits(1), 1, initializer=[0])  # Sign flag for result
+        # Only IDLE and DIV_WORKING remain, so the state is a single bit: each state guard
+        # reads one flop instead of decoding a wider encoding
+        self.state = RegArray(Bits(1), 1, initializer=[0])  # FSM state
+
+        # Working set, packed into one register since the IDLE start and every
+        # DIV_WORKING iteration always write all of it together:
+        # {div_cnt[100:96], quotient[95:64], rem_dvd[63:0]}
+        # div_cnt: iterations left minus one (counts down, so up to 32 iterations fit in
+        # 5 bits); quotient: quotient accumulator
+        # rem_dvd: partial remainder and unconsumed dividend bits as one shift register,
+        # {remainder[63:32], dividend[31:0]}. The remainder is always < d < 2^32, so 32 bits suffice.
+        self.working = RegArray(Bits(101), 1, initializer=[0])
+
+        # QDS divisor multiples: 8*d decides the top digit bit, 1*d..7*d the low three bits.
+        # Only the multiples that need an adder are stored, packed into one register:
+        # {d7[107:72], d5[71:36], d3[35:0]}
+        # 1d, 2d, 4d, 8d are |divisor| from the request register shifted by wiring, and 6d is
+        # 3d shifted by one (see read_multiples). The radix-2 datapath only needs 1d.
+        if radix == 16:
+            self.odd_multiples = RegArray(Bits(108), 1, initializer=[0])
 
         # FSM states
-        self.IDLE = Bits(3)(0)
-        self.DIV_PRE = Bits(3)(1)
-        self.DIV_WORKING = Bits(3)(2)
-        self.DIV_END = Bits(3)(3)
-        self.DIV_1 = Bits(3)(4)
-        self.DIV_ERROR = Bits(3)(5)
+        self.IDLE = Bits(1)(0)
+        self.DIV_WORKING = Bits(1)(1)
+
+        # Constants reused across every unrolled step, built once per instance
+        step_log2 = self.step_bits.bit_length() - 1
+        self.STEP_SHIFT = UInt(5)(step_log2 + self.unroll_log2)  # log2(quotient bits retired per cycle)
+        self.ZERO_36 = Bits(36)(0)
+
+    @classmethod
+    def specialize_for_constant(cls, divisor):
+        # Fixed-function replacement for an unsigned divide by a known constant
+        return ConstantDivider(divisor)
 
     def is_busy(self):
         # Check if divider is currently processing
         return self.busy[0]
 
-    def quotient_select(self, shifted_rem, d1, d2, d3, d4, d5, d6, d7, d8, d9, d10, d11, d12, d13, d14, d15):
+    def read_request(self):
+        # Unpack the latched operands.
+        # Returns: (dividend_in, dividend_abs, divisor_abs, dividend_neg, divisor_neg, is_rem, rd_in)
+        # dividend_neg / divisor_neg are already gated by is_signed.
+        req = self.request[0]
+        if self.signed:
+            return (req[64:95], req[0:31], req[32:63], req[96:96], req[97:97], req[98:98], req[99:103])
+        return (req[0:31], req[0:31], req[32:63], Bits(1)(0), Bits(1)(0), req[64:64], req[65:69])
+
+    def read_working(self):
+        # Unpack the iteration state.
+        # Returns: (rem_dvd, quotient, div_cnt)
+        work = self.working[0]
+        return (work[0:63], work[64:95], work[96:100])
+
+    def read_multiples(self, divisor_abs):
+        # Expand the stored multiples to the full set.
+        # Returns: (d1, d2, d3, d4, d5, d6, d7, d8), each Bits(36)
+        odd = self.odd_multiples[0]
+        d3, d5, d7 = odd[0:35], odd[36:71], odd[72:107]
+        d1 = concat(Bits(4)(0), divisor_abs)
+        d2 = concat(Bits(3)(0), divisor_abs, Bits(1)(0))
+        d4 = concat(Bits(2)(0), divisor_abs, Bits(2)(0))
+        d8 = concat(Bits(1)(0), divisor_abs, Bits(3)(0))
+        d6 = concat(d3[0:34], Bits(1)(0))  # 3d < 2^34, so the top bit shifted out is 0
+        return (d1, d2, d3, d4, d5, d6, d7, d8)
+
+    def quotient_select(self, shifted_rem, d1, d2, d3, d4, d5, d6, d7, d8):
         """
         QDS (Quotient Digit Selection) for Radix-16 division.
-        Returns quotient digit from {0, 1, 2, ..., 15}.
+        Returns (q_digit, new_rem): the quotient digit from {0, 1, 2, ..., 15}
+        and the partial remainder shifted_rem - q_digit * d.
+
+        Each comparison is a trial subtraction: the borrow-out of x - k*d is the
+        "x < k*d" signal, and the difference itself is the new remainder when k is
+        selected. The digit is found in two levels: x - 8d decides the top bit, and
+        the surviving operand (x or x - 8d) is then tested against d..7d, so 8
+        subtractors cover all 15 multiples.
+        """
+        # Level 1: top digit bit, ge_8d = shifted_rem >= 8*d (37 bits wide to keep the borrow)
+        rem_37 = concat(Bits(1)(0), shifted_rem).bitcast(UInt(37))
+        trial_8d = (rem_37 - concat(Bits(1)(0), d8).bitcast(UInt(37))).bitcast(Bits(37))
+        q3 = ~_msb(trial_8d)
+        low_rem = q3.select(trial_8d[0:35], shifted_rem)  # < 8*d in both cases
+
+        # Level 2: low 3 digit bits from trial subtractions of d..7d, computed in parallel
+        low_37 = concat(Bits(1)(0), low_rem).bitcast(UInt(37))
+        ge = [None]  # ge[k] = low_rem >= k*d
+        diff = [low_rem]  # diff[k] = low_rem - k*d (diff[0] = low_rem)
+        for dk in (d1, d2, d3, d4, d5, d6, d7):
+            trial = (low_37 - concat(Bits(1)(0), dk).bitcast(UInt(37))).bitcast(Bits(37))
+            ge.append(~_msb(trial))
+            diff.append(trial[0:35])
+
+        # The ge signals form a thermometer code (ge[k] implies ge[j] for j < k), so every
+        # quotient bit is a flat AND-OR over its 1->0 edges instead of a select tree:
+        # bit b of q is set iff q lies in [k, k + 2^b) for some odd multiple k of 2^b
+        q_bits = []
+        for b in range(3):
+            step = 1 << b
+            q_b = None
+            for k in range(step, 8, 2 * step):
+                term = ge[k] if k + step == 8 else (ge[k] & ~ge[k + step])
+                q_b = term if q_b is None else (q_b | term)
+            q_bits.append(q_b)
+        q0, q1, q2 = q_bits
+
+        # Combine bits into 4-bit quotient digit: q = {q3, q2, q1, q0}
+        q = concat(q3, q2, q1, q0)
+
+        # Pick the winning difference straight from the one-hot thermometer edges
+        # (ge[k] & ~ge[k + 1]), so the remainder path does not wait for the digit encode
+        new_rem = None
+        for k in range(8):
+            hit = ~ge[1] if k == 0 else (ge[k] if k == 7 else (ge[k] & ~ge[k + 1]))
+            term = hit.select(diff[k], self.ZERO_36)
+            new_rem = term if new_rem is None else (new_rem | term)
+
+        return q, new_rem
+
+    def radix2_select(self, shifted_rem, d):
         """
-        # All comparisons computed in parallel (in hardware)
-        # Level 1: MSB selection - compare with 8d
-        ge_8d = (shifted_rem.bitcast(UInt(36)) >= d8.bitcast(UInt(36)))
-
-        # Level 2: Second bit selection
-        # If >= 8d, compare with 12d; else compare with 4d
-        ge_12d = (shifted_rem.bitcast(UInt(36)) >= d12.bitcast(UInt(36)))
-        ge_4d = (shifted_rem.bitcast(UInt(36)) >= d4.bitcast(UInt(36)))
-
-        # Level 3: Third bit selection (6 comparisons total here for all paths)
-        ge_14d = (shifted_rem.bitcast(UInt(36)) >= d14.bitcast(UInt(36)))
-        ge_10d = (shifted_rem.bitcast(UInt(36)) >= d10.bitcast(UInt(36)))
-        ge_6d = (shifted_rem.bitcast(UInt(36)) >= d6.bitcast(UInt(36)))
-        ge_2d = (shifted_rem.bitcast(UInt(36)) >= d2.bitcast(UInt(36)))
-
-        # Level 4: LSB selection (8 comparisons total here for precision)
-        ge_15d = (shifted_rem.bitcast(UInt(36)) >= d15.bitcast(UInt(36)))
-        ge_13d = (shifted_rem.bitcast(UInt(36)) >= d13.bitcast(UInt(36)))
-        ge_11d = (shifted_rem.bitcast(UInt(36)) >= d11.bitcast(UInt(36)))
-        ge_9d = (shifted_rem.bitcast(UInt(36)) >= d9.bitcast(UInt(36)))
-        ge_7d = (shifted_rem.bitcast(UInt(36)) >= d7.bitcast(UInt(36)))
-        ge_5d = (shifted_rem.bitcast(UInt(36)) >= d5.bitcast(UInt(36)))
-        ge_3d = (shifted_rem.bitcast(UInt(36)) >= d3.bitcast(UInt(36)))
-        ge_1d = (shifted_rem.bitcast(UInt(36)) >= d1.bitcast(UInt(36)))
-
-        # Build quotient using binary search tree structure
-        # q[3] = ge_8d
-        q3 = ge_8d
-
-        q2 = ge_8d.select(ge_12d, ge_4d)
-
-        q1_high = ge_12d.select(ge_14d, ge_10d)  # For q >= 8
-        q1_low = ge_4d.select(ge_6d, ge_2d)  # For q < 8
-        q1 = ge_8d.select(q1_high, q1_low)
-
-        # Upper half (q >= 8)
-        q0_14_15 = ge_15d  # Range 14-15
-        q0_12_13 = ge_13d  # Range 12-13
-        q0_10_11 = ge_11d  # Range 10-11
-        q0_8_9 = ge_9d  # Range 8-9
-
-        # Lower half (q < 8)
-        q0_6_7 = ge_7d  # Range 6-7
-        q0_4_5 = ge_5d  # Range 4-5
-        q0_2_3 = ge_3d  # Range 2-3
-        q0_0_1 = ge_1d  # Range 0-1
-
-        # Select within upper half (q >= 8)
-        q0_upper_upper = ge_12d.select(
-            ge_14d.select(q0_14_15, q0_12_13),  # q >= 12
-            ge_10d.select(q0_10_11, q0_8_9)  # 8 <= q < 12
-        )
-
-        # Select within lower half (q < 8)
-        q0_lower_upper = ge_4d.select(
-            ge_6d.select(q0_6_7, q0_4_5),  # 4 <= q < 8
-            ge_2d.select(q0_2_3, q0_0_1)  # q < 4
-        )
-
-        q0 = ge_8d.select(q0_upper_upper, q0_lower_upper)
-
-        # Combine bits into 4-bit quotient digit
-        # Using proper bit concatenation: q = {q3, q2, q1, q0}
-        q = concat(
-            concat(
-                concat(
-                    q3.select(Bits(1)(1), Bits(1)(0)),
-                    q2.select(Bits(1)(1), Bits(1)(0))
-                ),
-                q1.select(Bits(1)(1), Bits(1)(0))
-            ),
-            q0.select(Bits(1)(1), Bits(1)(0))
-        )
-
-        return q
+        Quotient bit selection for the radix-2 datapath.
+        Returns (q_bit, new_rem): one trial subtraction of d from the 33-bit
+        shifted_rem, whose borrow-out is the complement of the quotient bit; the
+        difference is kept when it is non-negative (restoring by selection, so
+        nothing is ever added back).
+        """
+        rem_34 = concat(Bits(1)(0), shifted_rem).bitcast(UInt(34))
+        trial = (rem_34 - concat(Bits(2)(0), d).bitcast(UInt(34))).bitcast(Bits(34))
+        q_bit = ~_msb(trial)
+        new_rem = q_bit.select(trial[0:31], shifted_rem[0:31])  # < d in both cases
+        return q_bit, new_rem
 
     def start_divide(self, dividend, divisor, is_signed, is_rem, rd=Bits(5)(0)):
         """
@@ -165,11 +263,14 @@ class Radix16Divider:
             is_rem: 1 to return remainder, 0 to return quotient
             rd: Destination register (5-bit), defaults to 0
         """
-        self.dividend_in[0] = dividend
-        self.divisor_in[0] = divisor
-        self.is_signed[0] = is_signed
-        self.is_rem[0] = is_rem
-        self.rd_in[0] = rd
+        if self.signed:
+            # Convert to magnitudes here so IDLE starts from unsigned operands
+            dividend_neg = is_signed & _msb(dividend)
+            divisor_neg = is_signed & _msb(divisor)
+            self.request[0] = concat(rd, is_rem, divisor_neg, dividend_neg, dividend,
+                                     _negate_if(divisor, divisor_neg), _negate_if(dividend, dividend_neg))
+        else:
+            self.request[0] = concat(rd, is_rem, divisor, dividend)
         self.valid_in[0] = Bits(1)(1)
         self.busy[0] = Bits(1)(1)
         self.ready[0] = Bits(1)(0)
@@ -182,260 +283,154 @@ class Radix16Divider:
         Execute one cycle of the Radix-16 state machine.
         Should be called every clock cycle.
         """
+        dividend_in, dividend_abs, divisor_abs, dividend_is_neg, divisor_is_neg, is_rem, rd_in = self.read_request()
+        # The remainder follows the dividend's sign; the quotient is negative when the signs differ.
+        # Both flags are already gated by is_signed (constant 0 for the unsigned specialization).
+        result_neg = is_rem.select(dividend_is_neg, dividend_is_neg ^ divisor_is_neg)
+
         # State: IDLE - Wait for valid signal and check for special cases
         with Condition(self.state[0] == self.IDLE):
-            with Condition(self.valid_in[0] == Bits(1)(1)):
+            with Condition(self.valid_in[0]):
                 # Check for special cases
-                div_by_zero = (self.divisor_in[0] == Bits(32)(0))
-                div_by_one = (self.divisor_in[0] == Bits(32)(1))
-
-                with Condition(div_by_zero):
-                    # Handle division by zero per RISC-V spec
-                    self.state[0] = self.DIV_ERROR
-                    self.valid_in[0] = Bits(1)(0)
+                div_by_zero = (divisor_abs == Bits(32)(0))
+                # |divisor| = 2^k (including 1, and -1 when signed): quotient and remainder
+                # are a shift and a mask of |dividend|, with the usual sign correction.
+                # -(-2^31) / 1 wraps to -2^31, which is exactly the RISC-V signed-overflow result.
+                divisor_m1 = (divisor_abs.bitcast(UInt(32)) - UInt(32)(1)).bitcast(Bits(32))
+                div_by_pow2 = ((divisor_abs & divisor_m1) == Bits(32)(0))
+                _, divisor_lz = _count_leading_zeros(divisor_abs)
+                pow2_shift = (~divisor_lz).bitcast(UInt(5))  # k = 31 - clz(divisor)
+                quotient_on_pow2 = (dividend_abs.bitcast(UInt(32)) >> pow2_shift).bitcast(Bits(32))
+                remainder_on_pow2 = dividend_abs & divisor_m1
+                # Pick the requested output first so only one value needs a negator
+                result_on_pow2 = is_rem.select(remainder_on_pow2, quotient_on_pow2)
+                if self.signed:
+                    result_on_pow2 = _negate_if(result_on_pow2, result_neg)
+                # |dividend| < |divisor|: quotient = 0, remainder = dividend
+                dividend_lt_divisor = (dividend_abs.bitcast(UInt(32)) < divisor_abs.bitcast(UInt(32)))
+                trivial = div_by_zero | div_by_pow2 | dividend_lt_divisor
+
+                # Results of the trivial cases, by priority: /0, /2^k, |a| < |b|
+                # Division by zero per RISC-V spec: quotient = -1 (2^32-1 for unsigned,
+                # same bit pattern), remainder = dividend
+                trivial_q = div_by_zero.select(Bits(32)(0xFFFFFFFF), Bits(32)(0))
+                trivial_result = (~div_by_zero & div_by_pow2).select(
+                    result_on_pow2,
+                    is_rem.select(dividend_in, trivial_q)
+                )
 
-                with Condition(~div_by_zero & div_by_one):
-                    # Fast path for divisor = 1
-                    self.state[0] = self.DIV_1
+                with Condition(trivial):
+                    # Return the trivial result in the same cycle, without leaving IDLE
+                    self.result[0] = trivial_result
+                    self.ready[0] = Bits(1)(1)
+                    self.rd_out[0] = rd_in
+                    self.error[0] = div_by_zero
+                    self.busy[0] = Bits(1)(0)
                     self.valid_in[0] = Bits(1)(0)
 
-                with Condition(~div_by_zero & ~div_by_one):
-                    # Normal division path - go to preprocessing
-                    self.state[0] = self.DIV_PRE
+                with Condition(~trivial):
+                    # Normal division path - preprocess and start iterating right away
+                    self.state[0] = self.DIV_WORKING
                     self.valid_in[0] = Bits(1)(0)
 
-                    # Convert to unsigned if signed
-                    dividend_is_neg = self.is_signed[0] & self.dividend_in[0][31:31]
-                    divisor_is_neg = self.is_signed[0] & self.divisor_in[0][31:31]
-
-                    # Take absolute value if negative
-                    dividend_abs = dividend_is_neg.select(
-                        (~self.dividend_in[0] + Bits(32)(1)).bitcast(Bits(32)),
-                        self.dividend_in[0]
-                    )
-                    divisor_abs = divisor_is_neg.select(
-                        (~self.divisor_in[0] + Bits(32)(1)).bitcast(Bits(32)),
-                        self.divisor_in[0]
-                    )
-
-                    self.dividend_r[0] = dividend_abs
-                    self.divisor_r[0] = divisor_abs
-                    self.div_sign[0] = concat(self.dividend_in[0][31:31], self.divisor_in[0][31:31])
-                    self.sign_r[0] = self.is_signed[0]
-
-        # State: DIV_ERROR - Handle division by zero
-        with Condition(self.state[0] == self.DIV_ERROR):
-            # Return RISC-V specified error values
-            quotient_on_div0 = self.is_signed[0].select(
-                Bits(32)(0xFFFFFFFF),  # -1 for signed
-                Bits(32)(0xFFFFFFFF)  # 2^32-1 for unsigned (same bit pattern)
-            )
-            self.result[0] = self.is_rem[0].select(
-                self.dividend_in[0],  # Remainder = dividend
-                quotient_on_div0  # Quotient = -1 or 2^32-1
-            )
-            self.ready[0] = Bits(1)(1)
-            self.rd_out[0] = self.rd_in[0]
-            self.error[0] = Bits(1)(1)
-            self.busy[0] = Bits(1)(0)
-            self.state[0] = self.IDLE
-
-        # State: DIV_1 - Fast path for divisor = 1
-        with Condition(self.state[0] == self.DIV_1):
-            # Fast path: quotient is dividend, remainder is 0
-            self.result[0] = self.is_rem[0].select(
-                Bits(32)(0),  # Remainder = 0
-                self.dividend_in[0]  # Quotient = dividend
-            )
-            self.ready[0] = Bits(1)(1)
-            self.rd_out[0] = self.rd_in[0]
-            self.busy[0] = Bits(1)(0)
-            self.state[0] = self.IDLE
-
-        # State: DIV_PRE - Preprocessing for Radix-16 division
-        with Condition(self.state[0] == self.DIV_PRE):
-            divisor = self.divisor_r[0]
-            dividend = self.dividend_r[0]
-
-            # Compute divisor multiples (36 bits to handle 15*d overflow)
-            d_36 = concat(Bits(4)(0), divisor)  # 36-bit divisor
-
-            # Compute 1d through 15d using efficient combinations
-            d1_val = d_36
-            d2_val = (d_36.bitcast(UInt(36)) << UInt(36)(1)).bitcast(Bits(36))  # 2*d
-            d3_val = (d2_val.bitcast(UInt(36)) + d_36.bitcast(UInt(36))).bitcast(Bits(36))  # 3*d = 2d + d
-            d4_val = (d_36.bitcast(UInt(36)) << UInt(36)(2)).bitcast(Bits(36))  # 4*d
-            d5_val = (d4_val.bitcast(UInt(36)) + d_36.bitcast(UInt(36))).bitcast(Bits(36))  # 5*d = 4d + d
-            d6_val = (d4_val.bitcast(UInt(36)) + d2_val.bitcast(UInt(36))).bitcast(Bits(36))  # 6*d = 4d + 2d
-            d7_val = (d4_val.bitcast(UInt(36)) + d3_val.bitcast(UInt(36))).bitcast(Bits(36))  # 7*d = 4d + 3d
-            d8_val = (d_36.bitcast(UInt(36)) << UInt(36)(3)).bitcast(Bits(36))  # 8*d
-            d9_val = (d8_val.bitcast(UInt(36)) + d_36.bitcast(UInt(36))).bitcast(Bits(36))  # 9*d = 8d + d
-            d10_val = (d8_val.bitcast(UInt(36)) + d2_val.bitcast(UInt(36))).bitcast(Bits(36))  # 10*d = 8d + 2d
-            d11_val = (d8_val.bitcast(UInt(36)) + d3_val.bitcast(UInt(36))).bitcast(Bits(36))  # 11*d = 8d + 3d
-            d12_val = (d8_val.bitcast(UInt(36)) + d4_val.bitcast(UInt(36))).bitcast(Bits(36))  # 12*d = 8d + 4d
-            d13_val = (d8_val.bitcast(UInt(36)) + d5_val.bitcast(UInt(36))).bitcast(Bits(36))  # 13*d = 8d + 5d
-            d14_val = (d8_val.bitcast(UInt(36)) + d6_val.bitcast(UInt(36))).bitcast(Bits(36))  # 14*d = 8d + 6d
-            d15_val = (d8_val.bitcast(UInt(36)) + d7_val.bitcast(UInt(36))).bitcast(Bits(36))  # 15*d = 8d + 7d
-
-            # Store divisor multiples
-            self.d1[0] = d1_val
-            self.d2[0] = d2_val
-            self.d3[0] = d3_val
-            self.d4[0] = d4_val
-            self.d5[0] = d5_val
-            self.d6[0] = d6_val
-            self.d7[0] = d7_val
-            self.d8[0] = d8_val
-            self.d9[0] = d9_val
-            self.d10[0] = d10_val
-            self.d11[0] = d11_val
-            self.d12[0] = d12_val
-            self.d13[0] = d13_val
-            self.d14[0] = d14_val
-            self.d15[0] = d15_val
-
-            # Initialize quotient to 0, remainder to 0
-            self.quotient[0] = Bits(32)(0)
-            self.remainder[0] = Bits(36)(0)
-
-            # For 32-bit division with 4 bits per iteration: ceil(32/4) = 8 iterations
-            self.div_cnt[0] = Bits(5)(8)
-
-            # Store dividend for iteration
-            self.dividend_r[0] = dividend
-
-            # Transition to DIV_WORKING
-            self.state[0] = self.DIV_WORKING
-
-        # State: DIV_WORKING - Radix-16 iteration
+                    if self.radix == 16:
+                        # Compute divisor multiples (36 bits, matching the partial remainder).
+                        # Kept as UInt throughout; each value is cast back to Bits once, when stored.
+                        d_36 = concat(Bits(4)(0), divisor_abs).bitcast(UInt(36))  # 36-bit divisor
+
+                        # Every other multiple is a shift of d or of 3d, so only 3d, 5d and 7d need
+                        # an adder: a single adder level with three adders in the preprocessing cycle
+                        d3_val = (d_36 << UInt(36)(1)) + d_36  # 3*d = 2d + d
+                        d5_val = (d_36 << UInt(36)(2)) + d_36  # 5*d = 4d + d
+                        d7_val = (d_36 << UInt(36)(3)) - d_36  # 7*d = 8d - d
+
+                        # Store the odd multiples
+                        self.odd_multiples[0] = concat(d7_val.bitcast(Bits(36)), d5_val.bitcast(Bits(36)),
+                                                       d3_val.bitcast(Bits(36)))
+
+                    # Skip leading iterations whose quotient digits must be 0.
+                    # With k = clz(divisor) - clz(dividend) (>= 0 since dividend >= divisor here),
+                    # the quotient fits in k + 1 bits, so only floor(k / 4) + 1 radix-16 steps
+                    # (k + 1 radix-2 steps) are needed, rounded up to whole iterations of
+                    # unroll_factor steps.
+                    _, dividend_lz = _count_leading_zeros(dividend_abs)
+                    lz_diff = divisor_lz.bitcast(UInt(5)) - dividend_lz.bitcast(UInt(5))
+                    iter_cnt_m1 = lz_diff >> self.STEP_SHIFT  # iterations needed - 1
+
+                    # The skipped steps would only shift dividend bits into the remainder:
+                    # {remainder, dividend} = dividend << (32 - quotient bits needed)
+                    skip_shift = (UInt(5)(self.iterations - 1) - iter_cnt_m1) << self.STEP_SHIFT
+                    preshifted = concat(Bits(32)(0), dividend_abs) << skip_shift
+
+                    # Initialize the counter to the iterations needed minus one (32-bit division:
+                    # at most 32 / step_bits steps, unroll_factor steps per iteration),
+                    # quotient to 0, and remainder/dividend to the pre-shifted dividend
+                    self.working[0] = concat(iter_cnt_m1.bitcast(Bits(5)), Bits(32)(0), preshifted)
+
+        # State: DIV_WORKING - Radix-16 (or radix-2) iteration(s)
         with Condition(self.state[0] == self.DIV_WORKING):
             # Get current values
-            rem_cur = self.remainder[0]  # 36-bit partial remainder
-            quot_cur = self.quotient[0]  # 32-bit quotient so far
-            dividend_cur = self.dividend_r[0]  # Remaining dividend bits
-
-            # Shift remainder left by 4 and bring in next 4 dividend bits
-            # Bits come from MSB of dividend_cur
-            next_bits = dividend_cur[28:31]  # Top 4 bits of dividend
-            shifted_rem = concat(rem_cur[0:31], next_bits)  # (rem << 4) | next_bits
-
-            # Shift dividend left by 4 (move next bits into position)
-            new_dividend = concat(dividend_cur[0:27], Bits(4)(0))
-
-            # Quotient digit selection using Radix-16 comparison
-            q_digit = self.quotient_select(
-                shifted_rem,
-                self.d1[0], self.d2[0], self.d3[0], self.d4[0],
-                self.d5[0], self.d6[0], self.d7[0], self.d8[0],
-                self.d9[0], self.d10[0], self.d11[0], self.d12[0],
-                self.d13[0], self.d14[0], self.d15[0]
-            )
-
-            # Compute new remainder based on quotient digit: rem = shifted_rem - q * d
-            q_times_d = (q_digit == Bits(4)(0)).select(
-                Bits(36)(0),
-                (q_digit == Bits(4)(1)).select(
-                    self.d1[0],
-                    (q_digit == Bits(4)(2)).select(
-                        self.d2[0],
-                        (q_digit == Bits(4)(3)).select(
-                            self.d3[0],
-                            (q_digit == Bits(4)(4)).select(
-                                self.d4[0],
-                                (q_digit == Bits(4)(5)).select(
-                                    self.d5[0],
-                                    (q_digit == Bits(4)(6)).select(
-                                        self.d6[0],
-                                        (q_digit == Bits(4)(7)).select(
-                                            self.d7[0],
-                                            (q_digit == Bits(4)(8)).select(
-                                                self.d8[0],
-                                                (q_digit == Bits(4)(9)).select(
-                                                    self.d9[0],
-                                                    (q_digit == Bits(4)(10)).select(
-                                                        self.d10[0],
-                                                        (q_digit == Bits(4)(11)).select(
-                                                            self.d11[0],
-                                                            (q_digit == Bits(4)(12)).select(
-                                                                self.d12[0],
-                                                                (q_digit == Bits(4)(13)).select(
-                                                                    self.d13[0],
-                                                                    (q_digit == Bits(4)(14)).select(
-                                                                        self.d14[0],
-                                                                        self.d15[0]  # q=15
-                                                                    )
-                                                                )
-                                                            )
-                                                        )
-                                                    )
-                                                )
-                                            )
-                                        )
-                                    )
-                                )
-                            )
-                        )
-                    )
-                )
-            )
-
-            new_rem = (shifted_rem.bitcast(UInt(36)) - q_times_d.bitcast(UInt(36))).bitcast(Bits(36))
-
-            # Update quotient: shift left by 4 and add new digit
-            new_quot = concat(quot_cur[0:27], q_digit)
+            # {partial remainder, remaining dividend bits}, 32-bit quotient so far, counter
+            new_rem_dvd, new_quot, div_cnt = self.read_working()
+            if self.radix == 16:
+                d1, d2, d3, d4, d5, d6, d7, d8 = self.read_multiples(divisor_abs)
+            b = self.step_bits
+
+            # Chain unroll_factor steps; intermediate values stay combinational
+            for _ in range(self.unroll_factor):
+                # Shift {remainder, dividend} left by b: the top 32 + b bits are
+                # (rem << b) | next b dividend bits. The shift itself is pure wiring.
+                shifted_rem = new_rem_dvd[32 - b:63]
+
+                # Quotient digit selection and remainder update: rem = shifted_rem - q * d
+                if self.radix == 16:
+                    q_digit, new_rem = self.quotient_select(shifted_rem, d1, d2, d3, d4, d5, d6, d7, d8)
+                else:
+                    q_digit, new_rem = self.radix2_select(shifted_rem, divisor_abs)
+
+                # New remainder (< d, so it fits in 32 bits) above the shifted dividend
+                new_rem_dvd = concat(new_rem[0:31], new_rem_dvd[0:31 - b], Bits(b)(0))
+
+                # Update quotient: shift left by b and add new digit
+                new_quot = concat(new_quot[0:31 - b], q_digit)
+
+            # Decrement counter (wraps past 0 only on the last iteration, which leaves DIV_WORKING)
+            new_cnt = (div_cnt.bitcast(UInt(5)) - UInt(5)(1)).bitcast(Bits(5))
+
+            # Early exit: once the partial remainder and the unconsumed dividend bits are
+            # both zero, every remaining quotient digit is 0. Shift the quotient left by
+            # step_bits * unroll_factor * (remaining iterations) to account for the skipped
+            # digits and finish now. Remaining iterations = div_cnt (iterations left minus
+            # the one just done), and the shift is at most 31, so it fits in 5 bits.
+            rem_is_zero = (new_rem_dvd == Bits(64)(0))
+            pad_shift = div_cnt.bitcast(UInt(5)) << self.STEP_SHIFT
+            quot_padded = new_quot << pad_shift
+
+            final_quot = rem_is_zero.select(quot_padded, new_quot)
 
             # Store updated values
-            self.remainder[0] = new_rem
-            self.quotient[0] = new_quot
-            self.dividend_r[0] = new_dividend
-
-            # Decrement counter
-            self.div_cnt[0] = (self.div_cnt[0].bitcast(UInt(5)) - UInt(5)(1)).bitcast(Bits(5))
-
-            # Check if done
-            is_last = (self.div_cnt[0] == Bits(5)(1))
-            with Condition(is_last):
-                self.state[0] = self.DIV_END
-
-        # State: DIV_END - Post-processing
-        with Condition(self.state[0] == self.DIV_END):
-            q_out = self.quotient[0]
-            rem_out = self.remainder[0][0:31]  # Take lower 32 bits of remainder
-
-            # Apply sign correction
-            q_needs_neg = (self.div_sign[0] == Bits(2)(0b01)) | (self.div_sign[0] == Bits(2)(0b10))
-            rem_needs_neg = self.div_sign[0][1:1]
-
-            # Check for signed overflow: (-2^31) / (-1)
-            min_int = Bits(32)(0x80000000)
-            neg_one = Bits(32)(0xFFFFFFFF)
-            signed_overflow = (self.sign_r[0] == Bits(1)(1)) & \
-                              (self.dividend_in[0] == min_int) & \
-                              (self.divisor_in[0] == neg_one)
-
-            with Condition(signed_overflow):
-                self.result[0] = self.is_rem[0].select(
-                    Bits(32)(0),
-                    Bits(32)(0x80000000)
-                )
+            self.working[0] = concat(new_cnt, final_quot, new_rem_dvd)
 
-            with Condition(~signed_overflow):
-                q_signed = (self.sign_r[0] & q_needs_neg).select(
-                    (~q_out + Bits(32)(1)).bitcast(Bits(32)),
-                    q_out
-                )
-                rem_signed = (self.sign_r[0] & rem_needs_neg).select(
-                    (~rem_out + Bits(32)(1)).bitcast(Bits(32)),
-                    rem_out
-                )
+            # Last iteration: post-processing is chained onto it, so the result is
+            # written in the same cycle instead of going through a separate DIV_END state
+            is_last = (div_cnt == Bits(5)(0))
+            with Condition(is_last | rem_is_zero):
+                # Select the requested output (remainder half of the shift register or
+                # the quotient) before sign correction, so only one 32-bit negator is needed
+                div_result = is_rem.select(new_rem_dvd[32:63], final_quot)
 
-                self.result[0] = self.is_rem[0].select(rem_signed, q_signed)
+                if self.signed:
+                    # Apply sign correction.
+                    # Signed overflow (-2^31 / -1) never gets here: it is a trivial case returned from IDLE.
+                    div_result = _negate_if(div_result, result_neg)
 
-            self.ready[0] = Bits(1)(1)
-            self.rd_out[0] = self.rd_in[0]
-            self.busy[0] = Bits(1)(0)
-            self.state[0] = self.IDLE
-            debug_log("DIV: Done=0x{:x}", self.result[0])
+                self.result[0] = div_result
+
+                self.ready[0] = Bits(1)(1)
+                self.rd_out[0] = rd_in
+                self.busy[0] = Bits(1)(0)
+                self.state[0] = self.IDLE
+                debug_log("DIV: Done=0x{:x}", div_result)
 
     def get_result_if_ready(self):
         # Get result if division is complete.
@@ -444,4 +439,50 @@ class Radix16Divider:
 
     def clear_result(self):
         # Clear result and reset ready flag
-        self.ready[0] = Bits(1)(0)
\ No newline at end of file
+        self.ready[0] = Bits(1)(0)
+
+
+class ConstantDivider:
+    """
+    Combinational unsigned divider for a divisor fixed at elaboration time.
+
+    No FSM and no QDS: with s = ceil(log2(d)) and magic c = ceil(2^(32+s) / d)
+    (at most 33 bits, see divider_magic.constant_divisor_magic), n // d ==
+    (n * c) >> (32 + s) for every 32-bit n, because the rounding error of c stays
+    below 2^(32+s) / d^2 <= 1 / d. The full product n * c needs 65 bits, so it is
+    formed in two halves that stay within 64: n * c[31:0] as a 64-bit
+    carry-save sum of shifted copies of n (one per set bit of c, reduced by 3:2
+    compressors to a single carry-propagate add), then n added into its upper 32 bits
+    (33-bit sum) when c[32] is set. The remainder is n - q * d computed modulo
+    2^32. Power-of-two divisors reduce to a slice and a mask.
+    """
+
+    def __init__(self, divisor):
+        self.divisor = divisor
+        self.magic, self.shift = constant_divisor_magic(divisor)
+        self.is_pow2 = (divisor & (divisor - 1)) == 0
+
+    def divide(self, dividend):
+        """
+        Args:
+            dividend: 32-bit unsigned dividend (Bits(32))
+
+        Returns: (quotient, remainder), both Bits(32)
+        """
+        if self.is_pow2:
+            if self.shift == 0:
+                return dividend, Bits(32)(0)
+            quotient = concat(Bits(self.shift)(0), dividend[self.shift:31])
+            return quotient, dividend & Bits(32)(self.divisor - 1)
+
+        # (n * c) >> 32 = (n * c[31:0]) >> 32 + n * c[32], at most 33 bits
+        product_lo = _mul_by_constant(dividend, self.magic & 0xFFFFFFFF, 64)
+        upper = concat(Bits(1)(0), product_lo[32:63]).bitcast(UInt(33))
+        if self.magic >> 32:
+            upper = upper + concat(Bits(1)(0), dividend).bitcast(UInt(33))
+
+        # q = upper >> s; s >= 2 for a non-power-of-two divisor, so 33 - s bits remain
+        quotient = concat(Bits(self.shift - 1)(0), upper.bitcast(Bits(33))[self.shift:32])
+        q_times_d = _mul_by_constant(quotient, self.divisor, 32)
+        remainder = (dividend.bitcast(UInt(32)) - q_times_d.bitcast(UInt(32))).bitcast(Bits(32))
+        return quotient, remainder
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Ahead-of-time build of the divider reference model (src/divider_model.py).
+
+Compiles divide() with numba.pycc into a `divider_ref` extension module next to
+this file, so regression sweeps import native code instead of paying the JIT
+compile cost on every run. Requires numba; build it once with
+
+    python -m src.divider_aot
+
+and then `from src import divider_ref`. numba.pycc is deprecated upstream;
+tests/test_divider_model.py runs this build whenever numba is installed, so a
+numba release that drops it shows up as a test failure rather than a stale .so.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from .divider_model import divide as _divide
+
+cc = CC("divider_ref")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Arguments: (dividend, divisor, is_signed, is_rem, unroll_factor, radix), as in divide()
+_SIGNATURE_ARGS = "(u4, u4, b1, b1, u4, u4)"
+
+
+@cc.export("divide", "u4" + _SIGNATURE_ARGS)
+def divide(dividend, divisor, is_signed, is_rem, unroll_factor, radix):
+    # Quotient or remainder, per is_rem
+    return _divide(dividend, divisor, is_signed, is_rem, unroll_factor, radix)[0]
+
+
+@cc.export("divide_error", "u4" + _SIGNATURE_ARGS)
+def divide_error(dividend, divisor, is_signed, is_rem, unroll_factor, radix):
+    # 1 on division by zero
+    return _divide(dividend, divisor, is_signed, is_rem, unroll_factor, radix)[1]
+
+
+@cc.export("divide_cycles", "u4" + _SIGNATURE_ARGS)
+def divide_cycles(dividend, divisor, is_signed, is_rem, unroll_factor, radix):
+    # tick() calls up to and including the one that writes the result
+    return _divide(dividend, divisor, is_signed, is_rem, unroll_factor, radix)[2]
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built {cc.name} in {cc.output_dir}")
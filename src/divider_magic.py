@@ -0,0 +1,20 @@
+"""
+Magic numbers for dividing by a constant, shared by the ConstantDivider RTL
+(src/divider.py) and its reference model (src/divider_model.py).
+
+Plain Python with no imports, so elaborating the CPU does not pull in the
+verification model or numba.
+"""
+
+
+def constant_divisor_magic(divisor):
+    """
+    Magic number for dividing 32-bit unsigned values by a constant divisor, as
+    used by ConstantDivider. Returns (magic, shift) with shift = ceil(log2(d)) and
+    magic = ceil(2^(32+shift) / d), so that n // d == (n * magic) >> (32 + shift)
+    for every 32-bit n. magic has at most 33 bits, so this stays plain Python
+    (the intermediate 2^(32+shift) does not fit a numba int64).
+    """
+    assert 0 < divisor <= 0xFFFFFFFF, "divisor must be a non-zero 32-bit constant"
+    shift = (divisor - 1).bit_length()
+    return ((1 << (32 + shift)) + divisor - 1) // divisor, shift
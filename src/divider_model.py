@@ -0,0 +1,255 @@
+"""
+Cycle-level reference model of Radix16Divider, for verification sweeps.
+
+Mirrors the hardware algorithm step by step (trivial cases returned in the IDLE
+cycle, leading-zero iteration skip, two-level radix-16 QDS or the radix-2 trial
+subtraction, early exit) so the results and the latency can be compared against
+the RTL. Everything is plain
+integer code, so when numba is installed the functions are JIT-compiled and
+divide_batch() runs a whole sweep in parallel; without it they run as ordinary
+Python.
+"""
+
+from .divider_magic import constant_divisor_magic
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional: fall back to the interpreter
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+MASK32 = 0xFFFFFFFF
+
+
+@njit(cache=True)
+def count_leading_zeros(x):
+    # Leading zeros of a non-zero 32-bit value
+    n = 0
+    bit = 31
+    while bit >= 0 and ((x >> bit) & 1) == 0:
+        n += 1
+        bit -= 1
+    return n
+
+
+@njit(cache=True)
+def negate_if(x, neg):
+    # 32-bit two's complement of x when neg is set
+    if neg:
+        return (-x) & MASK32
+    return x
+
+
+@njit(cache=True)
+def radix16_step(rem, dvd, d):
+    """
+    One DIV_WORKING step: shift the next 4 dividend bits into the remainder and
+    pick the largest digit q with q * d <= shifted remainder, first against 8d and
+    then against d..7d, like quotient_select().
+    Returns (q_digit, new_rem, new_dvd).
+    """
+    shifted_rem = (rem << 4) | (dvd >> 28)
+    new_dvd = (dvd << 4) & MASK32
+
+    q = 0
+    if shifted_rem >= 8 * d:
+        q = 8
+        shifted_rem -= 8 * d
+    k = 7
+    while k > 0 and shifted_rem < k * d:
+        k -= 1
+    return q + k, shifted_rem - k * d, new_dvd
+
+
+@njit(cache=True)
+def radix2_step(rem, dvd, d):
+    """
+    One radix-2 DIV_WORKING step: shift the next dividend bit into the remainder
+    and subtract d if it fits, like radix2_select().
+    Returns (q_bit, new_rem, new_dvd).
+    """
+    shifted_rem = (rem << 1) | (dvd >> 31)
+    new_dvd = (dvd << 1) & MASK32
+    if shifted_rem >= d:
+        return 1, shifted_rem - d, new_dvd
+    return 0, shifted_rem, new_dvd
+
+
+@njit(cache=True)
+def check_config(unroll_factor, radix):
+    # Same constraints as Radix16Divider.__init__: anything else would model a
+    # divider that cannot be built and silently return wrong results
+    assert radix == 2 or radix == 16, "radix must be 2 or 16"
+    steps = 8 if radix == 16 else 32
+    assert 0 < unroll_factor <= steps and unroll_factor & (unroll_factor - 1) == 0, \
+        "unroll_factor must be a power of two dividing the radix steps"
+
+
+@njit(cache=True)
+def cycle_shift(unroll_factor, radix):
+    # log2 of the quotient bits retired per DIV_WORKING cycle
+    shift = 2 if radix == 16 else 0
+    while (1 << shift) < unroll_factor * (4 if radix == 16 else 1):
+        shift += 1
+    return shift
+
+
+@njit(cache=True)
+def divide(dividend, divisor, is_signed, is_rem, unroll_factor=1, radix=16):
+    """
+    Model one DIV/DIVU/REM/REMU through the divider.
+
+    Args:
+        dividend, divisor: 32-bit operands as unsigned integers (rs1, rs2)
+        is_signed: True for DIV/REM, False for DIVU/REMU
+        is_rem: True to return the remainder, False for the quotient
+        unroll_factor: steps per DIV_WORKING cycle (1, 2, 4 or 8 for radix 16,
+            a power of two up to 32 for radix 2; anything else
+            raises AssertionError, as in Radix16Divider)
+        radix: 16 or 2, as in Radix16Divider
+
+    Returns: (result, error, cycles)
+        cycles counts tick() calls up to and including the one that writes the
+        result: 1 for a case resolved in IDLE, 1 + iterations otherwise.
+    """
+    check_config(unroll_factor, radix)
+    dividend &= MASK32
+    divisor &= MASK32
+
+    # start_divide: magnitudes and sign flags
+    dividend_neg = is_signed and (dividend >> 31) == 1
+    divisor_neg = is_signed and (divisor >> 31) == 1
+    dividend_abs = negate_if(dividend, dividend_neg)
+    divisor_abs = negate_if(divisor, divisor_neg)
+    q_neg = dividend_neg != divisor_neg
+
+    # IDLE: trivial cases, by priority /0, /2^k, |a| < |b|
+    if divisor_abs == 0:
+        return (dividend if is_rem else MASK32), 1, 1
+    if (divisor_abs & (divisor_abs - 1)) == 0:
+        shift = 31 - count_leading_zeros(divisor_abs)
+        if is_rem:
+            return negate_if(dividend_abs & (divisor_abs - 1), dividend_neg), 0, 1
+        return negate_if(dividend_abs >> shift, q_neg), 0, 1
+    if dividend_abs < divisor_abs:
+        return (dividend if is_rem else 0), 0, 1
+
+    # IDLE: leading-zero skip and pre-shift of {remainder, dividend}
+    step_shift = cycle_shift(unroll_factor, radix)
+    iterations = 32 >> step_shift
+    lz_diff = count_leading_zeros(divisor_abs) - count_leading_zeros(dividend_abs)
+    iter_cnt_m1 = lz_diff >> step_shift
+    skip_shift = (iterations - 1 - iter_cnt_m1) << step_shift
+    preshifted = dividend_abs << skip_shift
+    rem = preshifted >> 32
+    dvd = preshifted & MASK32
+
+    # DIV_WORKING: unroll_factor steps per cycle, early exit once nothing is left
+    quot = 0
+    cnt = iter_cnt_m1 + 1
+    cycles = 1
+    while True:
+        for _ in range(unroll_factor):
+            if radix == 16:
+                q_digit, rem, dvd = radix16_step(rem, dvd, divisor_abs)
+                quot = ((quot << 4) | q_digit) & MASK32
+            else:
+                q_digit, rem, dvd = radix2_step(rem, dvd, divisor_abs)
+                quot = ((quot << 1) | q_digit) & MASK32
+        cnt -= 1
+        cycles += 1
+        if rem == 0 and dvd == 0:
+            quot = (quot << (cnt << step_shift)) & MASK32
+            break
+        if cnt == 0:
+            break
+
+    # Sign correction chained onto the last iteration
+    if is_rem:
+        return negate_if(rem, dividend_neg), 0, cycles
+    return negate_if(quot, q_neg), 0, cycles
+
+
+@njit(cache=True)
+def divide_fast(dividend, divisor, is_signed, is_rem, unroll_factor=1, radix=16):
+    """
+    Same (result, error, cycles) as divide(), without stepping the QDS.
+
+    The result comes from native integer division. The cycle count follows from
+    where the leading-zero skip starts and where the early exit fires: after
+    iteration i the hardware holds {|a| >> r mod |d|, low r bits of |a|}, with r
+    the dividend bits not yet consumed, so the exit needs only a mod and a mask
+    per iteration. For sweeps that only need the result or the latency
+    statistics.
+    """
+    check_config(unroll_factor, radix)
+    dividend &= MASK32
+    divisor &= MASK32
+
+    dividend_neg = is_signed and (dividend >> 31) == 1
+    divisor_neg = is_signed and (divisor >> 31) == 1
+    dividend_abs = negate_if(dividend, dividend_neg)
+    divisor_abs = negate_if(divisor, divisor_neg)
+    q_neg = dividend_neg != divisor_neg
+
+    if divisor_abs == 0:
+        return (dividend if is_rem else MASK32), 1, 1
+    quot = dividend_abs // divisor_abs
+    rem = dividend_abs - quot * divisor_abs
+
+    # Trivial cases (/2^k, |a| < |b|) finish in IDLE; otherwise count iterations
+    cycles = 1
+    if (divisor_abs & (divisor_abs - 1)) != 0 and dividend_abs >= divisor_abs:
+        step_shift = cycle_shift(unroll_factor, radix)
+        step_bits = 1 << step_shift
+        lz_diff = count_leading_zeros(divisor_abs) - count_leading_zeros(dividend_abs)
+        iter_cnt = (lz_diff >> step_shift) + 1
+        remaining = iter_cnt * step_bits
+        for i in range(1, iter_cnt + 1):
+            remaining -= step_bits
+            cycles = 1 + i
+            low_bits = dividend_abs & ((1 << remaining) - 1)
+            if low_bits == 0 and (dividend_abs >> remaining) % divisor_abs == 0:
+                break
+
+    if is_rem:
+        return negate_if(rem, dividend_neg), 0, cycles
+    return negate_if(quot, q_neg), 0, cycles
+
+
+def constant_divide(dividend, divisor):
+    """
+    Model of ConstantDivider.divide(): (quotient, remainder) computed the way the
+    hardware does, with the 65-bit product n * magic split into n * magic[31:0]
+    (64 bits) plus n * magic[32] added into the upper half.
+    """
+    magic, shift = constant_divisor_magic(divisor)
+    if (divisor & (divisor - 1)) == 0:
+        return dividend >> shift, dividend & (divisor - 1)
+    upper = ((dividend * (magic & MASK32)) >> 32) + (dividend if magic >> 32 else 0)  # < 2^33
+    quotient = upper >> shift
+    return quotient, (dividend - quotient * divisor) & MASK32
+
+
+@njit(parallel=True, cache=True)
+def divide_batch(dividends, divisors, signed_flags, rem_flags, out_result, out_error, out_cycles,
+                 unroll_factor=1, radix=16):
+    """
+    Run divide() over arrays of test vectors, writing into pre-allocated outputs.
+
+    The inputs and outputs are equal-length contiguous NumPy integer arrays
+    (np.uint32 works for all of them); under numba the loop is split across
+    cores with prange. Entry i of the outputs receives the (result, error,
+    cycles) of divide() on entry i of the inputs.
+    """
+    check_config(unroll_factor, radix)
+    for i in prange(len(dividends)):
+        result, error, cycles = divide(dividends[i], divisors[i], bool(signed_flags[i]), bool(rem_flags[i]),
+                                       unroll_factor, radix)
+        out_result[i] = result
+        out_error[i] = error
+        out_cycles[i] = cycles
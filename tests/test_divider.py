@@ -0,0 +1,234 @@
+import sys
+import os
+import random
+import re
+
+# 1. 环境路径设置 (确保能 import src)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from assassyn.frontend import *
+
+# 导入你的设计
+from src.divider import Radix16Divider
+from src.divider_model import MASK32, divide
+from tests.common import run_test_module
+
+# 被测配置: (signed, unroll_factor, radix)
+CONFIGS = [
+    (True, 1, 16),
+    (False, 1, 16),
+    (True, 2, 16),
+    (True, 8, 16),
+    (True, 1, 2),
+    (False, 4, 2),
+    (True, 32, 2),
+]
+
+EDGE_VALUES = [0, 1, 3, 7, 0x7FFFFFFF, 0x80000000, 0xFFFFFFFF]
+
+# ConstantDivider 的除数: 常见小常数、magic 为 33 位的 7、边界值与 2 的幂
+CONST_DIVISORS = [1, 3, 7, 10, 641, 64, 0x7FFFFFFF, 0x80000001, 0xFFFFFFFF]
+
+
+def make_vectors(signed, seed=2024):
+    """
+    测试向量: (dividend, divisor, is_signed, is_rem)
+    覆盖 ÷0、÷±2^k、|a| < |b|、有符号溢出、整除 (提前结束) 与随机操作数
+    """
+    rng = random.Random(seed)
+    pairs = [(a, b) for a in EDGE_VALUES for b in EDGE_VALUES]
+    pairs += [(0x30000000, 3), (50, 7), (100, 7), (1000, 64)]
+    for _ in range(16):
+        b = rng.getrandbits(rng.randint(1, 32))
+        pairs.append((rng.getrandbits(32), b))
+        pairs.append(((b * rng.getrandbits(8)) & MASK32, b))
+    vectors = []
+    for i, (a, b) in enumerate(pairs):
+        is_signed = signed and i % 2 == 0
+        vectors.append((a, b, is_signed, (i // 2) % 2 == 1))
+    return vectors
+
+
+# ==============================================================================
+# 1. Driver 模块定义：逐个发出除法请求，记录结果与延迟
+# ==============================================================================
+class Driver(Module):
+    def __init__(self, signed, unroll_factor, radix):
+        super().__init__(ports={})
+        self.name = "DividerDriver"
+
+        # 被测除法器 (与 Execution 一样作为子单元挂在模块上)
+        self.divider = Radix16Divider(signed=signed, unroll_factor=unroll_factor, radix=radix)
+
+    @module.combinational
+    def build(self, vectors):
+        # 1. 周期计数器
+        cnt = RegArray(UInt(32), 1)
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+
+        # 2. 当前向量下标、是否已发出、发出时的周期
+        vec_idx = RegArray(UInt(32), 1)
+        issued = RegArray(Bits(1), 1)
+        start_cnt = RegArray(UInt(32), 1)
+        idx = vec_idx[0]
+
+        # 所有向量都已取回结果时结束仿真
+        with Condition(idx >= UInt(32)(len(vectors))):
+            finish()
+
+        # 3. 组合逻辑 Mux：根据 idx 选择当前的操作数
+        cur_a = Bits(32)(0)
+        cur_b = Bits(32)(0)
+        cur_signed = Bits(1)(0)
+        cur_rem = Bits(1)(0)
+        for i, (a, b, is_signed, is_rem) in enumerate(vectors):
+            is_match = idx == UInt(32)(i)
+            cur_a = is_match.select(Bits(32)(a), cur_a)
+            cur_b = is_match.select(Bits(32)(b), cur_b)
+            cur_signed = is_match.select(Bits(1)(int(is_signed)), cur_signed)
+            cur_rem = is_match.select(Bits(1)(int(is_rem)), cur_rem)
+
+        # 4. 除法器空闲且上一条结果已取走时发出下一条
+        can_issue = (
+            (issued[0] == Bits(1)(0))
+            & (self.divider.is_busy() == Bits(1)(0))
+            & (idx < UInt(32)(len(vectors)))
+        )
+        with Condition(can_issue):
+            self.divider.start_divide(cur_a, cur_b, cur_signed, cur_rem, Bits(5)(1))
+            (issued & self)[0] <= Bits(1)(1)
+            (start_cnt & self)[0] <= cnt[0]
+
+        self.divider.tick()
+
+        # 5. 结果就绪：打印结果与延迟 (发出到看到 ready 的周期差)，然后取下一条
+        ready, result, _, error = self.divider.get_result_if_ready()
+        with Condition(ready == Bits(1)(1)):
+            log(
+                "DIV_TEST: idx={} result=0x{:x} error={} latency={}",
+                idx,
+                result,
+                error,
+                cnt[0] - start_cnt[0],
+            )
+            self.divider.clear_result()
+            (issued & self)[0] <= Bits(1)(0)
+            (vec_idx & self)[0] <= idx + UInt(32)(1)
+
+        return cnt
+
+
+class ConstantDriver(Module):
+    def __init__(self, divisors):
+        super().__init__(ports={})
+        self.name = "ConstantDividerDriver"
+
+        # 每个除数一个纯组合的 ConstantDivider
+        self.dividers = [Radix16Divider.specialize_for_constant(d) for d in divisors]
+
+    @module.combinational
+    def build(self, dividends):
+        # 1. 周期计数器，每周期送一个被除数
+        cnt = RegArray(UInt(32), 1)
+        (cnt & self)[0] <= cnt[0] + UInt(32)(1)
+        idx = cnt[0]
+
+        with Condition(idx >= UInt(32)(len(dividends))):
+            finish()
+
+        cur_n = Bits(32)(0)
+        for i, n in enumerate(dividends):
+            cur_n = (idx == UInt(32)(i)).select(Bits(32)(n), cur_n)
+
+        # 2. 同一周期内所有除数的商与余数
+        with Condition(idx < UInt(32)(len(dividends))):
+            for divider in self.dividers:
+                quotient, remainder = divider.divide(cur_n)
+                log(
+                    "CONST_TEST: d=0x{:x} n=0x{:x} q=0x{:x} r=0x{:x}",
+                    Bits(32)(divider.divisor),
+                    cur_n,
+                    quotient,
+                    remainder,
+                )
+
+        return cnt
+
+
+# ==============================================================================
+# 2. 验证逻辑 (Python Check)：与 divider_model.divide() 逐条比对结果与周期数
+# ==============================================================================
+def check(raw_output, vectors, unroll_factor, radix):
+    print(">>> 开始验证日志...")
+
+    pattern = re.compile(r"DIV_TEST: idx=(\d+) result=0x([0-9a-fA-F]+) error=(\d+) latency=(\d+)")
+    captured = []
+    for line in raw_output.split("\n"):
+        m = pattern.search(line)
+        if m:
+            captured.append(tuple(int(g, 16) if k == 1 else int(g) for k, g in enumerate(m.groups())))
+
+    assert len(captured) == len(vectors), f"预期 {len(vectors)} 个结果，实际 {len(captured)} 个"
+
+    for idx, result, error, latency in captured:
+        a, b, is_signed, is_rem = vectors[idx]
+        exp_result, exp_error, exp_cycles = divide(a, b, is_signed, is_rem, unroll_factor, radix)
+        # 发出后第 1 个 tick() 才看到请求，写出结果的下一个周期才读到 ready，
+        # 因此 latency = 模型的 cycles (tick 次数) + 1
+        assert (result, error, latency - 1) == (exp_result, exp_error, exp_cycles), (
+            f"向量 {idx}: a=0x{a:x} b=0x{b:x} signed={is_signed} rem={is_rem} "
+            f"实际 (0x{result:x}, {error}, {latency - 1}) 预期 (0x{exp_result:x}, {exp_error}, {exp_cycles})"
+        )
+
+    print(f"✅ 除法器 {len(captured)} 条结果与参考模型一致 (结果与周期数)")
+
+
+def check_constant(raw_output, divisors, dividends):
+    print(">>> 开始验证 ConstantDivider 日志...")
+
+    pattern = re.compile(r"CONST_TEST: d=0x([0-9a-fA-F]+) n=0x([0-9a-fA-F]+) q=0x([0-9a-fA-F]+) r=0x([0-9a-fA-F]+)")
+    captured = [tuple(int(g, 16) for g in m.groups()) for m in pattern.finditer(raw_output)]
+
+    expected = len(divisors) * len(dividends)
+    assert len(captured) == expected, f"预期 {expected} 个结果，实际 {len(captured)} 个"
+
+    for d, n, q, r in captured:
+        assert d in divisors, f"未知除数 0x{d:x}"
+        assert (q, r) == (n // d, n % d), (
+            f"0x{n:x} / 0x{d:x}: 实际 (0x{q:x}, 0x{r:x}) 预期 (0x{n // d:x}, 0x{n % d:x})"
+        )
+
+    print(f"✅ ConstantDivider {len(captured)} 条结果与 n // d、n % d 一致")
+
+
+# ==============================================================================
+# 3. 主执行入口
+# ==============================================================================
+if __name__ == "__main__":
+    for signed, unroll_factor, radix in CONFIGS:
+        vectors = make_vectors(signed)
+        sys = SysBuilder(f"test_divider_{'s' if signed else 'u'}_u{unroll_factor}_r{radix}")
+
+        with sys:
+            driver = Driver(signed, unroll_factor, radix)
+
+            # [关键] 暴露 Driver 的计数器，防止被 DCE 优化掉
+            driver_cnt = driver.build(vectors)
+            sys.expose_on_top(driver_cnt, kind="Output")
+
+        run_test_module(
+            sys,
+            lambda raw, v=vectors, u=unroll_factor, r=radix: check(raw, v, u, r),
+        )
+
+    # ConstantDivider: 边界被除数 + 随机被除数，对每个常数除数比对 n // d 与 n % d
+    rng = random.Random(2024)
+    dividends = EDGE_VALUES + [0xFFFFFFFE, 1000000, 0x12345678] + [rng.getrandbits(32) for _ in range(32)]
+    sys = SysBuilder("test_divider_constant")
+
+    with sys:
+        driver = ConstantDriver(CONST_DIVISORS)
+        driver_cnt = driver.build(dividends)
+        sys.expose_on_top(driver_cnt, kind="Output")
+
+    run_test_module(sys, lambda raw: check_constant(raw, CONST_DIVISORS, dividends))
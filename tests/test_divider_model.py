@@ -0,0 +1,176 @@
+import os
+import random
+import sys
+
+import pytest
+
+# 环境路径设置 (确保能 import src)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.divider_model import MASK32, constant_divide, constant_divisor_magic, divide, divide_batch, divide_fast
+
+
+def riscv_div(a, b, is_signed, is_rem):
+    """RISC-V M 扩展规定的 DIV/DIVU/REM/REMU 结果"""
+    if b == 0:
+        return a if is_rem else MASK32
+    if is_signed:
+        sa = a - (1 << 32) if a >> 31 else a
+        sb = b - (1 << 32) if b >> 31 else b
+        if sa == -(1 << 31) and sb == -1:
+            return 0 if is_rem else a
+        q = abs(sa) // abs(sb)
+        if (sa < 0) != (sb < 0):
+            q = -q
+        return ((sa - q * sb) if is_rem else q) & MASK32
+    return (a % b) if is_rem else (a // b)
+
+
+# (radix, unroll_factor) 组合
+CONFIGS = [(16, 1), (16, 2), (16, 4), (16, 8), (2, 1), (2, 4), (2, 32)]
+
+EDGE_VALUES = [0, 1, 2, 3, 7, 10, 0xFFFF, 0x10000, 0x7FFFFFFF, 0x80000000, 0x80000001, 0xFFFFFFFE, 0xFFFFFFFF]
+
+
+@pytest.mark.parametrize("radix, unroll_factor", CONFIGS)
+def test_edge_values_match_spec(radix, unroll_factor):
+    for a in EDGE_VALUES:
+        for b in EDGE_VALUES:
+            for is_signed in (False, True):
+                for is_rem in (False, True):
+                    result, error, _ = divide(a, b, is_signed, is_rem, unroll_factor, radix)
+                    assert result == riscv_div(a, b, is_signed, is_rem), (hex(a), hex(b), is_signed, is_rem)
+                    assert error == (1 if b == 0 else 0)
+
+
+@pytest.mark.parametrize("radix, unroll_factor", CONFIGS)
+def test_random_operands_match_spec(radix, unroll_factor):
+    rng = random.Random(2024)
+    for _ in range(2000):
+        a = rng.getrandbits(rng.randint(1, 32))
+        b = rng.getrandbits(rng.randint(1, 32))
+        if rng.random() < 0.2:
+            b = 1 << rng.randint(0, 31)
+        is_signed = rng.random() < 0.5
+        is_rem = rng.random() < 0.5
+        result, _, cycles = divide(a, b, is_signed, is_rem, unroll_factor, radix)
+        assert result == riscv_div(a, b, is_signed, is_rem), (hex(a), hex(b), is_signed, is_rem)
+        assert 1 <= cycles <= 1 + (32 if radix == 2 else 8) // unroll_factor
+
+
+def test_trivial_cases_finish_in_idle():
+    # ÷0, |除数| 为 2 的幂 (含 ±1), |被除数| < |除数| 都在 IDLE 周期返回
+    assert divide(123, 0, False, False)[2] == 1
+    assert divide(0x80000000, MASK32, True, False) == (0x80000000, 0, 1)
+    assert divide(1000, 64, False, False)[2] == 1
+    assert divide(5, 7, True, True) == (5, 0, 1)
+
+
+def test_leading_zero_skip_and_early_exit():
+    # 前导零之差为 3, 商只有 1 个 radix-16 位: 1 次迭代
+    assert divide(50, 7, False, False) == (7, 0, 2)
+    # 前导零之差为 4, 需要 2 次迭代
+    assert divide(100, 7, False, False) == (14, 0, 3)
+    # 满宽度商需要全部 8 次迭代
+    assert divide(MASK32, 3, False, False) == (0x55555555, 0, 9)
+    # 余数与剩余被除数提前归零: 0x30000000 / 3 在第一次迭代后结束
+    assert divide(0x30000000, 3, False, False) == (0x10000000, 0, 2)
+
+
+def test_radix2_latency():
+    # radix-2 每周期 1 位商: 前导零之差为 3 时需要 4 次迭代
+    assert divide(50, 7, False, False, 1, 2) == (7, 0, 5)
+    # 前导零之差为 30: 31 次迭代
+    assert divide(MASK32, 3, False, False, 1, 2) == (0x55555555, 0, 32)
+    # 展开 4 步时与 radix-16 的周期数相同
+    assert divide(MASK32, 3, False, False, 4, 2) == (0x55555555, 0, 9)
+
+
+@pytest.mark.parametrize("radix, unroll_factor", CONFIGS)
+def test_fast_path_matches_stepped_model(radix, unroll_factor):
+    # 结果与周期数 (含前导零跳过与提前结束) 都要与逐步模型一致
+    rng = random.Random(99)
+    cases = [(a, b) for a in EDGE_VALUES for b in EDGE_VALUES]
+    for _ in range(3000):
+        b = rng.getrandbits(rng.randint(1, 16))
+        a = b * rng.getrandbits(rng.randint(0, 16)) << rng.randint(0, 8) if rng.random() < 0.5 else rng.getrandbits(32)
+        cases.append((a & MASK32, b))
+    for a, b in cases:
+        for is_signed in (False, True):
+            for is_rem in (False, True):
+                expected = divide(a, b, is_signed, is_rem, unroll_factor, radix)
+                assert divide_fast(a, b, is_signed, is_rem, unroll_factor, radix) == expected, (hex(a), hex(b), is_signed, is_rem)
+
+
+@pytest.mark.parametrize("divisor", [1, 2, 3, 7, 10, 641, 1 << 31, (1 << 31) + 1, 0xFFFFFFFE, MASK32])
+def test_constant_divisor_magic(divisor):
+    # ConstantDivider 的 magic number: s = ceil(log2 d), c = ceil(2^(32+s) / d) 至多 33 位
+    magic, shift = constant_divisor_magic(divisor)
+    assert (1 << (shift - 1)) < divisor <= (1 << shift) if shift else divisor == 1
+    assert magic == -(-(1 << (32 + shift)) // divisor)
+    assert magic < (1 << 33)
+
+    rng = random.Random(divisor)
+    dividends = [0, 1, divisor - 1, divisor, divisor + 1, 0x7FFFFFFF, 0x80000000, MASK32 - 1, MASK32]
+    dividends += [rng.getrandbits(32) for _ in range(2000)]
+    for n in dividends:
+        n &= MASK32
+        # 完整公式与硬件的两半拆分 (64 位乘积 + 高半部加 n) 都要给出精确的商与余数
+        assert (n * magic) >> (32 + shift) == n // divisor, hex(n)
+        assert constant_divide(n, divisor) == (n // divisor, n % divisor), hex(n)
+
+
+@pytest.mark.parametrize("radix, unroll_factor", [(16, 3), (16, 16), (2, 64), (2, 0), (4, 1)])
+def test_unsupported_config_rejected(radix, unroll_factor):
+    # 与 Radix16Divider.__init__ 相同的约束，不能悄悄返回错误结果
+    for func in (divide, divide_fast):
+        with pytest.raises(AssertionError):
+            func(1000000, 7, False, False, unroll_factor, radix)
+
+
+def test_batch_matches_scalar():
+    # 用连续的 NumPy uint32 数组调用，覆盖 numba 下的 prange 路径
+    np = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    n = 500
+    dividends = np.array([rng.getrandbits(32) for _ in range(n)], dtype=np.uint32)
+    divisors = np.array([rng.getrandbits(rng.randint(0, 32)) for _ in range(n)], dtype=np.uint32)
+    signed_flags = np.array([rng.randint(0, 1) for _ in range(n)], dtype=np.uint32)
+    rem_flags = np.array([rng.randint(0, 1) for _ in range(n)], dtype=np.uint32)
+    out_result = np.zeros(n, dtype=np.uint32)
+    out_error = np.zeros(n, dtype=np.uint32)
+    out_cycles = np.zeros(n, dtype=np.uint32)
+
+    divide_batch(dividends, divisors, signed_flags, rem_flags, out_result, out_error, out_cycles, 2)
+
+    for i in range(n):
+        a, b = int(dividends[i]), int(divisors[i])
+        is_signed, is_rem = bool(signed_flags[i]), bool(rem_flags[i])
+        expected = divide(a, b, is_signed, is_rem, 2)
+        assert (int(out_result[i]), int(out_error[i]), int(out_cycles[i])) == expected
+        assert int(out_result[i]) == riscv_div(a, b, is_signed, is_rem)
+
+
+def test_aot_build_matches_model(tmp_path):
+    # 安装了 numba 时实际执行一次 AOT 编译 (输出到临时目录)，再与 Python 模型逐项对比
+    pytest.importorskip("numba.pycc")
+    import importlib.util
+    from src import divider_aot
+
+    divider_aot.cc.output_dir = str(tmp_path)
+    divider_aot.cc.compile()
+    built = next(tmp_path.glob(divider_aot.cc.name + "*"))
+    spec = importlib.util.spec_from_file_location(divider_aot.cc.name, built)
+    divider_ref = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(divider_ref)
+
+    rng = random.Random(11)
+    for radix, unroll_factor in CONFIGS:
+        for _ in range(200):
+            a, b = rng.getrandbits(32), rng.getrandbits(rng.randint(0, 32))
+            is_signed, is_rem = rng.random() < 0.5, rng.random() < 0.5
+            args = (a, b, is_signed, is_rem, unroll_factor, radix)
+            result, error, cycles = divide(*args)
+            assert divider_ref.divide(*args) == result
+            assert divider_ref.divide_error(*args) == error
+            assert divider_ref.divide_cycles(*args) == cycles